@@ -2,8 +2,9 @@ use crate::exclusion::{build_exclusion_matcher, filter_excluded_files, Exclusion
 use crate::git_utils::GitOps;
 use crate::git_utils::GitOpsTrait;
 use crate::merge_driver;
+use crate::todo_extractor_internal::aggregator::DEFAULT_MAX_FILE_SIZE;
 use crate::todo_md;
-use crate::{extract_marked_items_from_file, MarkedItem, MarkerConfig};
+use crate::{extract_marked_items_from_file_with_limit, MarkedItem, MarkerConfig};
 use clap::{Arg, ArgAction, ArgMatches, Command};
 use git2::Repository;
 use log::{error, info};
@@ -88,6 +89,8 @@ struct ParsedArgs {
     exclude_patterns: Vec<String>,
     exclude_dir_patterns: Vec<String>,
     exclusion_rules: Vec<ExclusionRule>,
+    /// `None` when `--max-file-size 0` disabled the limit.
+    max_file_size: Option<u64>,
     files: Vec<PathBuf>,
     auto_add: bool,
     auto_install_merge_driver: bool,
@@ -119,6 +122,14 @@ impl ParsedArgs {
             build_exclusion_matcher(exclude_patterns.clone(), exclude_dir_patterns.clone())
                 .map_err(|e| format!("Error building exclusion patterns: {e}"))?;
 
+        let max_file_size = Some(
+            matches
+                .get_one::<u64>("max_file_size")
+                .copied()
+                .unwrap_or(DEFAULT_MAX_FILE_SIZE),
+        )
+        .filter(|&max| max > 0);
+
         let files: Vec<PathBuf> = matches
             .get_many::<String>("files")
             .map(|vals| vals.map(PathBuf::from).collect())
@@ -145,6 +156,7 @@ impl ParsedArgs {
             exclude_patterns,
             exclude_dir_patterns,
             exclusion_rules,
+            max_file_size,
             files,
             auto_add: matches.get_flag("auto_add"),
             auto_install_merge_driver: matches.get_flag("auto_install_merge_driver"),
@@ -208,6 +220,7 @@ mod mode {
             &args.marker_config,
             &args.exclude_patterns,
             &args.exclude_dir_patterns,
+            args.max_file_size,
             &args.todo_path,
         )
         .map_err(|e| format!("Error installing merge driver: {e}"))?;
@@ -246,6 +259,7 @@ mod mode {
             &args.marker_config,
             &args.exclude_patterns,
             &args.exclude_dir_patterns,
+            args.max_file_size,
             &args.todo_path,
         ) {
             Ok(None) => {
@@ -270,15 +284,77 @@ mod mode {
 // Shared helpers (used by multiple modes)
 // ---------------------------------------------------------------------------
 
-fn extract_todos_from_files(files: &[PathBuf], marker_config: &MarkerConfig) -> Vec<MarkedItem> {
-    let mut new_todos = Vec::new();
+/// Upper bound on extraction threads, whatever the core count.
+const MAX_EXTRACTION_WORKERS: usize = 32;
+
+/// Marked items extracted from a batch of files.
+#[derive(Default)]
+struct Extraction {
+    todos: Vec<MarkedItem>,
+    /// Files skipped for exceeding `--max-file-size`. They were never read,
+    /// so their existing TODO.md entries must be kept rather than cleared.
+    too_large: Vec<PathBuf>,
+}
+
+impl Extraction {
+    fn append(&mut self, mut other: Extraction) {
+        self.todos.append(&mut other.todos);
+        self.too_large.append(&mut other.too_large);
+    }
+}
+
+/// Extract marked items from every file, spreading the reads and parses over
+/// scoped worker threads. Files are split into contiguous chunks and the
+/// per-chunk results are concatenated back, so the output order matches
+/// `files` exactly as in a serial run.
+fn extract_todos_from_files(
+    files: &[PathBuf],
+    marker_config: &MarkerConfig,
+    max_file_size: Option<u64>,
+) -> Extraction {
+    let workers = std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1)
+        .min(MAX_EXTRACTION_WORKERS)
+        .min(files.len());
+    if workers <= 1 {
+        return extract_todos_serial(files, marker_config, max_file_size);
+    }
+
+    let chunk_size = files.len().div_ceil(workers);
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = files
+            .chunks(chunk_size)
+            .map(|chunk| {
+                scope.spawn(move || extract_todos_serial(chunk, marker_config, max_file_size))
+            })
+            .collect();
+        let mut extraction = Extraction::default();
+        for handle in handles {
+            extraction.append(
+                handle
+                    .join()
+                    .unwrap_or_else(|e| std::panic::resume_unwind(e)),
+            );
+        }
+        extraction
+    })
+}
+
+fn extract_todos_serial(
+    files: &[PathBuf],
+    marker_config: &MarkerConfig,
+    max_file_size: Option<u64>,
+) -> Extraction {
+    let mut extraction = Extraction::default();
     for file in files {
-        match extract_marked_items_from_file(file, marker_config) {
-            Ok(mut todos) => new_todos.append(&mut todos),
+        match extract_marked_items_from_file_with_limit(file, marker_config, max_file_size) {
+            Ok(Some(mut todos)) => extraction.todos.append(&mut todos),
+            Ok(None) => extraction.too_large.push(file.clone()),
             Err(e) => error!("Error processing file {:?}: {}", file, e),
         }
     }
-    new_todos
+    extraction
 }
 
 fn ensure_todo_path_exists(todo_path: &Path) -> Result<(), String> {
@@ -300,9 +376,12 @@ fn warn_if_todo_md_has_conflict_markers(todo_path: &Path) {
 
 /// Re-scan the current index and rewrite TODO.md from scratch.
 ///
-/// Shared by the `--regenerate` user command and the `--merge-driver` git
-/// entry point. Bypasses `sync_todo_file`'s read-merge-write step on
-/// purpose: writing from scratch is what wipes prior conflict markers.
+/// Shared by the `--regenerate` user command, the `--merge-driver` git
+/// entry point and the sync fallback. Bypasses `sync_todo_file`'s
+/// read-merge-write step on purpose: writing from scratch is what wipes
+/// prior conflict markers. The one exception is files skipped for
+/// `--max-file-size`: the rescan never reads them, so their entries are
+/// carried over from the TODO.md being replaced, as scan mode does.
 fn regenerate_todo_md(
     args: &ParsedArgs,
     repo: &Repository,
@@ -314,27 +393,52 @@ fn regenerate_todo_md(
         .get_tracked_files(repo)
         .map_err(|e| format!("failed to enumerate tracked files: {e}"))?;
     let filtered = filter_excluded_files(all_files, &args.exclusion_rules);
-    let todos = extract_todos_from_files(&filtered, &args.marker_config);
+    let extraction = extract_todos_from_files(&filtered, &args.marker_config, args.max_file_size);
+    let mut todos = extraction.todos;
     if validate_empty {
         validate_no_empty_todos(&todos)?;
     }
+    todos.extend(existing_todos_for(output_path, &extraction.too_large));
     todo_md::write_todo_file(output_path, todos)
         .map_err(|e| format!("failed to write {}: {e}", output_path.display()))?;
     Ok(())
 }
 
+/// The entries `todo_path` already lists for `files`. A TODO.md that is
+/// missing or does not parse (e.g. it still has conflict markers) has
+/// nothing to carry over.
+fn existing_todos_for(todo_path: &Path, files: &[PathBuf]) -> Vec<MarkedItem> {
+    if files.is_empty() {
+        return Vec::new();
+    }
+    match todo_md::read_todo_file(todo_path) {
+        Ok(existing) => existing
+            .into_iter()
+            .filter(|item| files.contains(&item.file_path))
+            .collect(),
+        Err(e) => {
+            info!("Not carrying over entries of skipped files: {e}");
+            Vec::new()
+        }
+    }
+}
+
 fn process_files(
     args: &ParsedArgs,
     repo: Repository,
     git_ops: &dyn GitOpsTrait,
 ) -> Result<(), String> {
-    let filtered_files = filter_excluded_files(args.files.clone(), &args.exclusion_rules);
-    let new_todos = extract_todos_from_files(&filtered_files, &args.marker_config);
+    let mut filtered_files = filter_excluded_files(args.files.clone(), &args.exclusion_rules);
+    let extraction =
+        extract_todos_from_files(&filtered_files, &args.marker_config, args.max_file_size);
     let todo_content_before = std::fs::read_to_string(&args.todo_path).ok();
 
-    validate_no_empty_todos(&new_todos)?;
+    validate_no_empty_todos(&extraction.todos)?;
 
-    if let Err(err) = todo_md::sync_todo_file(&args.todo_path, new_todos, filtered_files) {
+    // Oversized files were not scanned: leave them out of the merge so their
+    // existing TODO.md entries survive.
+    filtered_files.retain(|file| !extraction.too_large.contains(file));
+    if let Err(err) = todo_md::sync_todo_file(&args.todo_path, extraction.todos, filtered_files) {
         info!("There was an error updating TODO.md: {err}");
         sync_fallback_full_rescan(args, &repo, git_ops);
     }
@@ -352,16 +456,7 @@ fn process_files(
 /// broken and propagating the error would leave the user with two failures
 /// to read.
 fn sync_fallback_full_rescan(args: &ParsedArgs, repo: &Repository, git_ops: &dyn GitOpsTrait) {
-    let all_files = match git_ops.get_tracked_files(repo) {
-        Ok(files) => files,
-        Err(e) => {
-            error!("Error retrieving tracked files: {e}");
-            std::process::exit(1);
-        }
-    };
-    let filtered = filter_excluded_files(all_files, &args.exclusion_rules);
-    let todos = extract_todos_from_files(&filtered, &args.marker_config);
-    if let Err(err) = todo_md::write_todo_file(&args.todo_path, todos) {
+    if let Err(err) = regenerate_todo_md(args, repo, git_ops, &args.todo_path, false) {
         error!("Error updating TODO.md: {err}");
         std::process::exit(1);
     }
@@ -459,6 +554,14 @@ fn build_cli() -> Command {
                 .action(ArgAction::Append)
                 .global(true),
         )
+        .arg(
+            Arg::new("max_file_size")
+                .long("max-file-size")
+                .value_name("BYTES")
+                .help("Skip files larger than this many bytes (default: 1 MiB) without reading them. Use 0 to disable the limit.")
+                .value_parser(clap::value_parser!(u64))
+                .global(true),
+        )
         .arg(
             Arg::new("auto_install_merge_driver")
                 .long("auto-install-merge-driver")
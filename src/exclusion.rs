@@ -3,8 +3,10 @@
 //! This module provides functionality to filter files and directories using glob patterns,
 //! supporting wildcards like `*`, `?`, and `**` for recursive matching.
 
-use globset::Glob;
+use globset::{Glob, GlobSet, GlobSetBuilder};
 use log::info;
+use std::borrow::Cow;
+use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
 
 /// Exclusion rule type
@@ -24,8 +26,193 @@ pub struct ExclusionRule {
     glob: globset::GlobMatcher,
 }
 
+impl ExclusionRule {
+    /// Whether this rule only applies to directories (and files beneath them)
+    fn is_dir_only(&self) -> bool {
+        self.pattern.ends_with('/') || matches!(self.kind, ExclusionKind::ExcludeDir)
+    }
+}
+
+/// All exclusion rules compiled into two glob sets, one per rule kind
+///
+/// Since any matching rule excludes the path, the rules are merged into a
+/// single `GlobSet` per kind, so each candidate string costs one set lookup
+/// no matter how many patterns were given.
+#[derive(Debug, Clone)]
+struct ExclusionSet {
+    /// Regular `--exclude` patterns
+    any: GlobSet,
+    /// Directory-only patterns (`--exclude-dir` or a trailing `/`)
+    dir_only: GlobSet,
+}
+
+impl ExclusionSet {
+    /// Compile the given rules into an `ExclusionSet`
+    fn new(rules: &[ExclusionRule]) -> Result<Self, globset::Error> {
+        let mut any = GlobSetBuilder::new();
+        let mut dir_only = GlobSetBuilder::new();
+        for rule in rules {
+            let glob = rule.glob.glob().clone();
+            if rule.is_dir_only() {
+                dir_only.add(glob);
+            } else {
+                any.add(glob);
+            }
+        }
+        Ok(ExclusionSet {
+            any: any.build()?,
+            dir_only: dir_only.build()?,
+        })
+    }
+
+    /// Check if a path should be excluded
+    fn is_excluded(&self, path: &Path, is_dir: bool) -> bool {
+        let (full_path, file_name) = full_path_and_name(path);
+        let parts = JoinedComponents::new(path);
+        let n = parts.len();
+
+        if self.matches_any(&full_path, file_name, &parts) {
+            return true;
+        }
+
+        if !self.dir_only.is_empty() {
+            if is_dir {
+                if self.dir_only.is_match(&*full_path) || self.dir_only.is_match(file_name) {
+                    return true;
+                }
+                for i in 0..n {
+                    if self.dir_only.is_match(parts.span(i, n, true)) {
+                        return true;
+                    }
+                }
+            } else if self.dir_only_matches_parent(&parts, n.saturating_sub(1)) {
+                // Any parent directory of the file (but not the file itself)
+                return true;
+            }
+        }
+
+        false
+    }
+
+    /// Check if a file (not a directory) should be excluded, caching the
+    /// directory-only verdict for its parent directory in `parent_dirs`
+    ///
+    /// Directory-only rules can only match a file through its parent
+    /// directories, so every file under the same parent shares that verdict
+    /// and an excluded parent short-circuits the remaining checks.
+    fn is_file_excluded_cached(
+        &self,
+        path: &Path,
+        parent_dirs: &mut HashMap<PathBuf, bool>,
+    ) -> bool {
+        // The parent's components only line up with the file's own leading
+        // components when nothing is dropped as non-UTF-8.
+        let parent = match path.parent() {
+            Some(parent) if !self.dir_only.is_empty() && path.to_str().is_some() => parent,
+            _ => return self.is_excluded(path, false),
+        };
+        let parent_excluded = match parent_dirs.get(parent) {
+            Some(&excluded) => excluded,
+            None => {
+                let parent_parts = JoinedComponents::new(parent);
+                let excluded = self.dir_only_matches_parent(&parent_parts, parent_parts.len());
+                parent_dirs.insert(parent.to_path_buf(), excluded);
+                excluded
+            }
+        };
+        if parent_excluded {
+            return true;
+        }
+
+        let (full_path, file_name) = full_path_and_name(path);
+        self.matches_any(&full_path, file_name, &JoinedComponents::new(path))
+    }
+
+    /// Whether a regular pattern matches the path, its name or any suffix
+    fn matches_any(&self, full_path: &str, file_name: &str, parts: &JoinedComponents) -> bool {
+        if self.any.is_empty() {
+            return false;
+        }
+        if self.any.is_match(full_path) || self.any.is_match(file_name) {
+            return true;
+        }
+        let n = parts.len();
+        (0..n).any(|i| self.any.is_match(parts.span(i, n, false)))
+    }
+
+    /// Whether a directory-only pattern matches any run of the first `end`
+    /// components, with or without a trailing `/`
+    fn dir_only_matches_parent(&self, parts: &JoinedComponents, end: usize) -> bool {
+        for i in 0..end {
+            for j in (i + 1)..=end {
+                if self.dir_only.is_match(parts.span(i, j, false))
+                    || self.dir_only.is_match(parts.span(i, j, true))
+                {
+                    return true;
+                }
+            }
+        }
+        false
+    }
+}
+
+/// The path with separators normalized to `/`, and its file name
+///
+/// Only pays for a normalized copy when there is a separator to rewrite.
+fn full_path_and_name(path: &Path) -> (Cow<'_, str>, &str) {
+    let path_str = path.to_str().unwrap_or("");
+    let full_path = if path_str.contains('\\') {
+        Cow::Owned(normalize_pattern(path_str))
+    } else {
+        Cow::Borrowed(path_str)
+    };
+    let file_name = path.file_name().and_then(|n| n.to_str()).unwrap_or("");
+    (full_path, file_name)
+}
+
+/// A path's components joined with `/` (plus a trailing `/`), along with the
+/// byte offset where each component starts
+///
+/// Any run of consecutive components can then be sliced out of `joined`
+/// directly, instead of re-joining a fresh string for every candidate.
+struct JoinedComponents {
+    joined: String,
+    starts: Vec<usize>,
+}
+
+impl JoinedComponents {
+    fn new(path: &Path) -> Self {
+        let mut joined = String::new();
+        let mut starts = Vec::new();
+        for component in path.components().filter_map(|c| c.as_os_str().to_str()) {
+            starts.push(joined.len());
+            joined.push_str(component);
+            joined.push('/');
+        }
+        JoinedComponents { joined, starts }
+    }
+
+    fn len(&self) -> usize {
+        self.starts.len()
+    }
+
+    /// Components `i..j` joined with `/`, optionally keeping the trailing `/`
+    fn span(&self, i: usize, j: usize, trailing_slash: bool) -> &str {
+        let end = self.starts.get(j).copied().unwrap_or(self.joined.len());
+        if trailing_slash {
+            &self.joined[self.starts[i]..end]
+        } else {
+            &self.joined[self.starts[i]..end - 1]
+        }
+    }
+}
+
 /// Build the exclusion matcher from CLI arguments
 ///
+/// Empty patterns are dropped and repeated patterns are only compiled once,
+/// keeping the first occurrence, so the matcher never does the same work
+/// twice for a path.
+///
 /// # Arguments
 /// * `exclude_patterns` - Patterns for `--exclude` flag (files or directories)
 /// * `exclude_dir_patterns` - Patterns for `--exclude-dir` flag (directories only)
@@ -37,10 +224,19 @@ pub fn build_exclusion_matcher(
     exclude_dir_patterns: Vec<String>,
 ) -> Result<Vec<ExclusionRule>, String> {
     let mut rules = Vec::new();
+    // Normalized globs already compiled; `--exclude build/` and
+    // `--exclude-dir build` end up as the same entry.
+    let mut seen = HashSet::new();
 
     // Add --exclude patterns
     for pattern in exclude_patterns {
+        if pattern.is_empty() {
+            continue;
+        }
         let normalized = normalize_pattern(&pattern);
+        if !seen.insert(normalized.clone()) {
+            continue;
+        }
         let glob = Glob::new(&normalized)
             .map_err(|e| format!("Invalid exclude pattern '{}': {}", pattern, e))?
             .compile_matcher();
@@ -53,12 +249,18 @@ pub fn build_exclusion_matcher(
 
     // Add --exclude-dir patterns (ensure they end with /)
     for pattern in exclude_dir_patterns {
+        if pattern.is_empty() {
+            continue;
+        }
         let pattern_with_slash = if pattern.ends_with('/') {
             pattern.clone()
         } else {
             format!("{}/", pattern)
         };
         let normalized = normalize_pattern(&pattern_with_slash);
+        if !seen.insert(normalized.clone()) {
+            continue;
+        }
         let glob = Glob::new(&normalized)
             .map_err(|e| format!("Invalid exclude-dir pattern '{}': {}", pattern, e))?
             .compile_matcher();
@@ -69,6 +271,10 @@ pub fn build_exclusion_matcher(
         });
     }
 
+    // Report a failure to combine the patterns here, with the other pattern
+    // errors, so matching never has to handle it.
+    ExclusionSet::new(&rules).map_err(|e| format!("Invalid exclude patterns: {}", e))?;
+
     Ok(rules)
 }
 
@@ -77,7 +283,12 @@ fn normalize_pattern(pattern: &str) -> String {
     pattern.replace('\\', "/")
 }
 
-/// Check if a path should be excluded based on exclusion rules
+/// Check if a single path should be excluded based on exclusion rules
+///
+/// A convenience wrapper: the rules are compiled into glob sets on every
+/// call, which makes each call far more expensive than a match. To check
+/// more than a handful of paths, use `filter_excluded_files`, which compiles
+/// them once for the whole batch.
 ///
 /// # Arguments
 /// * `path` - The path to check
@@ -85,89 +296,15 @@ fn normalize_pattern(pattern: &str) -> String {
 /// * `rules` - The exclusion rules to apply
 ///
 /// # Returns
-/// `true` if the path should be excluded (last match wins), `false` otherwise
+/// `true` if any rule matches, `false` otherwise
 pub fn should_exclude(path: &Path, is_dir: bool, rules: &[ExclusionRule]) -> bool {
-    // Try to match against both the full path and just the file/dir name components
-    let path_str = path.to_str().unwrap_or("");
-    let normalized_full_path = normalize_pattern(path_str);
-
-    // Also get just the filename/dirname for simple pattern matching
-    let file_name = path.file_name().and_then(|n| n.to_str()).unwrap_or("");
-
-    // Get path components for relative path matching
-    let components: Vec<&str> = path
-        .components()
-        .filter_map(|c| c.as_os_str().to_str())
-        .collect();
-
-    let mut excluded = false;
-
-    for rule in rules {
-        let mut matches = false;
-
-        // Determine if this is a directory-only pattern
-        let is_dir_pattern =
-            rule.pattern.ends_with('/') || matches!(rule.kind, ExclusionKind::ExcludeDir);
-
-        if is_dir_pattern {
-            // This is a directory pattern - check if this is a dir OR if any parent is this dir
-            if is_dir {
-                // Check if the directory itself matches
-                matches =
-                    rule.glob.is_match(&normalized_full_path) || rule.glob.is_match(file_name);
-
-                if !matches {
-                    for i in 0..components.len() {
-                        let partial_path = components[i..].join("/") + "/";
-                        if rule.glob.is_match(&partial_path) {
-                            matches = true;
-                            break;
-                        }
-                    }
-                }
-            } else {
-                // For files, check if any parent directory matches the pattern
-                // e.g., if pattern is "src/" or "build" and file is "/path/build/output.rs", exclude it
-                for i in 0..components.len() - 1 {
-                    // -1 to exclude the filename itself
-                    // Build the path up to (but not including) the filename
-                    for j in (i + 1)..components.len() {
-                        // Start from i+1 to get directory paths
-                        let dir_path = components[i..j].join("/");
-                        // Check if this directory path matches the pattern
-                        if rule.glob.is_match(&dir_path)
-                            || rule.glob.is_match(&(dir_path.clone() + "/"))
-                        {
-                            matches = true;
-                            break;
-                        }
-                    }
-                    if matches {
-                        break;
-                    }
-                }
-            }
-        } else {
-            // Regular file/dir pattern
-            matches = rule.glob.is_match(&normalized_full_path) || rule.glob.is_match(file_name);
-
-            if !matches {
-                for i in 0..components.len() {
-                    let partial_path = components[i..].join("/");
-                    if rule.glob.is_match(&partial_path) {
-                        matches = true;
-                        break;
-                    }
-                }
-            }
-        }
-
-        if matches {
-            excluded = true; // Last match wins
-        }
-    }
+    compile_rules(rules).is_excluded(path, is_dir)
+}
 
-    excluded
+/// Compile rules that came out of `build_exclusion_matcher`, which already
+/// checked that they combine into an `ExclusionSet`
+fn compile_rules(rules: &[ExclusionRule]) -> ExclusionSet {
+    ExclusionSet::new(rules).expect("build_exclusion_matcher validates the combined rules")
 }
 
 /// Filter files based on exclusion rules
@@ -179,11 +316,25 @@ pub fn should_exclude(path: &Path, is_dir: bool, rules: &[ExclusionRule]) -> boo
 /// # Returns
 /// A filtered list of files with excluded files removed
 pub fn filter_excluded_files(files: Vec<PathBuf>, rules: &[ExclusionRule]) -> Vec<PathBuf> {
+    if rules.is_empty() {
+        return files;
+    }
+    // Compile the rules once for the whole batch
+    let set = compile_rules(rules);
+    // Only directory-only rules care about the file type, so don't pay a
+    // stat per path unless one is present.
+    let needs_file_type = rules.iter().any(ExclusionRule::is_dir_only);
+    // Directory-only verdicts per parent directory, shared by its files
+    let mut parent_dirs = HashMap::new();
     files
         .into_iter()
         .filter(|file| {
-            let is_dir = file.is_dir();
-            let should_exclude_file = should_exclude(file, is_dir, rules);
+            let is_dir = needs_file_type && file.is_dir();
+            let should_exclude_file = if is_dir {
+                set.is_excluded(file, is_dir)
+            } else {
+                set.is_file_excluded_cached(file, &mut parent_dirs)
+            };
             if should_exclude_file {
                 info!("Excluding: {:?}", file);
             }
@@ -235,6 +386,22 @@ mod tests {
         assert_eq!(rules.len(), 3);
     }
 
+    #[test]
+    fn test_build_exclusion_matcher_dedupes_patterns() {
+        let rules = build_exclusion_matcher(
+            vec![
+                "*.log".to_string(),
+                "".to_string(),
+                "build/".to_string(),
+                "*.log".to_string(),
+            ],
+            vec!["build".to_string(), "build/".to_string(), "".to_string()],
+        )
+        .unwrap();
+        let patterns: Vec<&str> = rules.iter().map(|r| r.pattern.as_str()).collect();
+        assert_eq!(patterns, vec!["*.log", "build/"]);
+    }
+
     #[test]
     fn test_build_exclusion_matcher_invalid_pattern() {
         let result = build_exclusion_matcher(vec!["[invalid".to_string()], vec![]);
@@ -356,4 +523,120 @@ mod tests {
         assert!(filtered.contains(&PathBuf::from("/tmp/file3.txt")));
         assert!(!filtered.contains(&PathBuf::from("/tmp/file2.log")));
     }
+
+    #[test]
+    fn test_filter_excluded_files_no_rules() {
+        let files = vec![PathBuf::from("/tmp/file1.txt"), PathBuf::from("/tmp/build")];
+        let filtered = filter_excluded_files(files.clone(), &[]);
+        assert_eq!(filtered, files);
+    }
+
+    #[test]
+    fn test_filter_excluded_files_dir_rule_on_directory() {
+        let temp_dir = tempfile::tempdir().unwrap();
+        let build_dir = temp_dir.path().join("build");
+        std::fs::create_dir(&build_dir).unwrap();
+        let source_file = temp_dir.path().join("main.rs");
+
+        let rules = build_exclusion_matcher(vec![], vec!["build".to_string()]).unwrap();
+        let filtered = filter_excluded_files(vec![build_dir, source_file.clone()], &rules);
+        assert_eq!(filtered, vec![source_file]);
+    }
+
+    #[test]
+    fn test_should_exclude_combined_rules() {
+        let rules = build_exclusion_matcher(
+            vec![
+                "*.log".to_string(),
+                "src/*.rs".to_string(),
+                "**/*.tmp".to_string(),
+                "docs/".to_string(),
+            ],
+            vec!["build".to_string(), "target/debug".to_string()],
+        )
+        .unwrap();
+
+        let test_cases = vec![
+            // (path, is_dir, expected_excluded)
+            ("/tmp/file.log", false, true),
+            ("/tmp/file.txt", false, false),
+            ("/tmp/src/main.rs", false, true),
+            ("/tmp/lib/main.rs", false, false),
+            ("/tmp/a/b/c/file.tmp", false, true),
+            ("/tmp/docs", true, true),
+            ("/tmp/docs/index.md", false, true),
+            ("/tmp/build", true, true),
+            ("/tmp/build/out.rs", false, true),
+            ("/tmp/src", true, false),
+            ("target/debug/main.rs", false, true),
+            ("target/release/main.rs", false, false),
+            ("main.rs", false, false),
+        ];
+
+        for (path, is_dir, expected) in test_cases {
+            assert_eq!(
+                should_exclude(Path::new(path), is_dir, &rules),
+                expected,
+                "Path '{}' (is_dir={}) should be {}",
+                path,
+                is_dir,
+                if expected { "excluded" } else { "included" }
+            );
+        }
+    }
+
+    #[test]
+    fn test_joined_components_span() {
+        let parts = JoinedComponents::new(Path::new("a/bb/c.rs"));
+        assert_eq!(parts.len(), 3);
+        assert_eq!(parts.span(0, 3, false), "a/bb/c.rs");
+        assert_eq!(parts.span(1, 3, false), "bb/c.rs");
+        assert_eq!(parts.span(1, 3, true), "bb/c.rs/");
+        assert_eq!(parts.span(0, 2, false), "a/bb");
+        assert_eq!(parts.span(0, 2, true), "a/bb/");
+        assert_eq!(parts.span(1, 2, false), "bb");
+    }
+
+    #[test]
+    fn test_is_file_excluded_cached_matches_is_excluded() {
+        let rules = build_exclusion_matcher(
+            vec!["*.log".to_string(), "docs/".to_string()],
+            vec!["build".to_string(), "target/debug".to_string()],
+        )
+        .unwrap();
+        let set = ExclusionSet::new(&rules).unwrap();
+        let mut parent_dirs = HashMap::new();
+
+        let paths = [
+            "build/a.rs",
+            "build/b.rs",
+            "src/main.rs",
+            "src/debug.log",
+            "docs/index.md",
+            "target/debug/main.rs",
+            "target/release/main.rs",
+            "target/debug/deps/lib.rs",
+            "main.rs",
+        ];
+        // Check twice so the second pass is answered from the cache
+        for path in paths.iter().chain(paths.iter()) {
+            assert_eq!(
+                set.is_file_excluded_cached(Path::new(path), &mut parent_dirs),
+                set.is_excluded(Path::new(path), false),
+                "cached and uncached exclusion disagree on '{}'",
+                path
+            );
+        }
+        // One entry per distinct parent directory
+        assert_eq!(parent_dirs.len(), 7);
+        assert_eq!(parent_dirs.get(Path::new("build")), Some(&true));
+        assert_eq!(parent_dirs.get(Path::new("src")), Some(&false));
+    }
+
+    #[test]
+    fn test_exclusion_set_empty() {
+        let set = ExclusionSet::new(&[]).unwrap();
+        assert!(!set.is_excluded(Path::new("/tmp/file.log"), false));
+        assert!(!set.is_excluded(Path::new("/tmp/build"), true));
+    }
 }
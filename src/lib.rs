@@ -13,7 +13,8 @@ mod todo_extractor_internal;
 
 // Re-export the public API directly at the crate root
 pub use todo_extractor_internal::aggregator::{
-    extract_marked_items_from_file, CommentLine, MarkedItem, MarkerConfig,
+    extract_marked_items_from_file, extract_marked_items_from_file_with_limit, CommentLine,
+    MarkedItem, MarkerConfig,
 };
 
 #[cfg(test)]
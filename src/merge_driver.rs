@@ -11,11 +11,12 @@
 //! byte-for-byte; rules inside are canonical, so a hand-edit between the
 //! markers will be reverted on the next install.
 //!
-//! Args are baked into the driver command (`--markers …`, `--exclude …`)
-//! because git invokes the driver as a plain subprocess with no awareness
-//! of CLI flags the user passed elsewhere — the registration has to be
-//! self-contained.
+//! Args are baked into the driver command (`--markers …`, `--exclude …`,
+//! `--max-file-size …`) because git invokes the driver as a plain
+//! subprocess with no awareness of CLI flags the user passed elsewhere —
+//! the registration has to be self-contained.
 
+use crate::todo_extractor_internal::aggregator::DEFAULT_MAX_FILE_SIZE;
 use crate::MarkerConfig;
 use git2::Repository;
 use std::path::{Path, PathBuf};
@@ -38,6 +39,7 @@ pub fn build_expected(
     markers: &MarkerConfig,
     exclude_patterns: &[String],
     exclude_dir_patterns: &[String],
+    max_file_size: Option<u64>,
     todo_path: &Path,
 ) -> Result<Expected, String> {
     if todo_path.is_absolute() {
@@ -46,8 +48,13 @@ pub fn build_expected(
             todo_path.display()
         ));
     }
-    let driver_command =
-        build_driver_command(markers, exclude_patterns, exclude_dir_patterns, todo_path);
+    let driver_command = build_driver_command(
+        markers,
+        exclude_patterns,
+        exclude_dir_patterns,
+        max_file_size,
+        todo_path,
+    );
     let pattern = quote_for_gitattributes(&todo_path.display().to_string());
     let gitattributes_block =
         format!("{BLOCK_BEGIN}\n{pattern} merge=rusty-todo-md\n{BLOCK_END}\n");
@@ -98,9 +105,16 @@ pub fn reconcile(
     markers: &MarkerConfig,
     exclude_patterns: &[String],
     exclude_dir_patterns: &[String],
+    max_file_size: Option<u64>,
     todo_path: &Path,
 ) -> Result<Option<InstallSummary>, String> {
-    let expected = build_expected(markers, exclude_patterns, exclude_dir_patterns, todo_path)?;
+    let expected = build_expected(
+        markers,
+        exclude_patterns,
+        exclude_dir_patterns,
+        max_file_size,
+        todo_path,
+    )?;
     if matches_expected(repo, &expected) {
         return Ok(None);
     }
@@ -115,9 +129,16 @@ pub fn install_driver(
     markers: &MarkerConfig,
     exclude_patterns: &[String],
     exclude_dir_patterns: &[String],
+    max_file_size: Option<u64>,
     todo_path: &Path,
 ) -> Result<InstallSummary, String> {
-    let expected = build_expected(markers, exclude_patterns, exclude_dir_patterns, todo_path)?;
+    let expected = build_expected(
+        markers,
+        exclude_patterns,
+        exclude_dir_patterns,
+        max_file_size,
+        todo_path,
+    )?;
     let was_in_sync = matches_expected(repo, &expected);
     install_to_match(repo, &expected, was_in_sync)
 }
@@ -165,12 +186,13 @@ fn install_to_match(
 }
 
 /// Build the `driver = ...` command. Bakes in non-default markers,
-/// exclusion patterns, and the TODO.md path so the driver runs with the
-/// same configuration the user installed.
+/// exclusion patterns, file size limit, and the TODO.md path so the driver
+/// runs with the same configuration the user installed.
 fn build_driver_command(
     markers: &MarkerConfig,
     exclude_patterns: &[String],
     exclude_dir_patterns: &[String],
+    max_file_size: Option<u64>,
     todo_path: &Path,
 ) -> String {
     let mut cmd = String::from("rusty-todo-md");
@@ -196,6 +218,11 @@ fn build_driver_command(
         cmd.push_str(" --exclude-dir ");
         cmd.push_str(&quote_for_shell(pat));
     }
+    // A disabled limit (`None`) is spelled `--max-file-size 0` on the CLI.
+    if max_file_size != Some(DEFAULT_MAX_FILE_SIZE) {
+        cmd.push_str(" --max-file-size ");
+        cmd.push_str(&max_file_size.unwrap_or(0).to_string());
+    }
     if todo_path != Path::new("TODO.md") {
         cmd.push_str(" --todo-path ");
         cmd.push_str(&quote_for_shell(&todo_path.display().to_string()));
@@ -345,7 +372,13 @@ mod tests {
     #[test]
     fn build_expected_rejects_absolute_todo_path() {
         let markers = MarkerConfig::normalized(vec!["TODO".to_string()]);
-        let result = build_expected(&markers, &[], &[], Path::new("/abs/TODO.md"));
+        let result = build_expected(
+            &markers,
+            &[],
+            &[],
+            Some(DEFAULT_MAX_FILE_SIZE),
+            Path::new("/abs/TODO.md"),
+        );
         let Err(msg) = result else {
             panic!("expected Err");
         };
@@ -355,7 +388,14 @@ mod tests {
     #[test]
     fn build_expected_quotes_path_with_specials() {
         let markers = MarkerConfig::normalized(vec!["TODO".to_string()]);
-        let expected = build_expected(&markers, &[], &[], Path::new("docs/my todos.md")).unwrap();
+        let expected = build_expected(
+            &markers,
+            &[],
+            &[],
+            Some(DEFAULT_MAX_FILE_SIZE),
+            Path::new("docs/my todos.md"),
+        )
+        .unwrap();
         assert!(
             expected
                 .gitattributes_block
@@ -372,15 +412,33 @@ mod tests {
             &markers,
             &["*.log".to_string()],
             &["vendor".to_string()],
+            Some(4194304),
             Path::new("docs/T.md"),
         );
         assert!(cmd.contains("--markers TODO FIXME"));
         assert!(cmd.contains("--exclude '*.log'"));
         assert!(cmd.contains("--exclude-dir vendor"));
+        assert!(cmd.contains("--max-file-size 4194304"));
         assert!(cmd.contains("--todo-path docs/T.md"));
         assert!(cmd.ends_with("--merge-driver %O %A %B"));
     }
 
+    #[test]
+    fn build_driver_command_max_file_size_only_when_not_default() {
+        let markers = MarkerConfig::normalized(vec!["TODO".to_string()]);
+        let default = build_driver_command(
+            &markers,
+            &[],
+            &[],
+            Some(DEFAULT_MAX_FILE_SIZE),
+            Path::new("TODO.md"),
+        );
+        assert!(!default.contains("--max-file-size"), "cmd: {default}");
+
+        let disabled = build_driver_command(&markers, &[], &[], None, Path::new("TODO.md"));
+        assert!(disabled.contains("--max-file-size 0"), "cmd: {disabled}");
+    }
+
     #[test]
     fn quote_for_shell_passes_safe_strings_through() {
         assert_eq!(quote_for_shell("TODO"), "TODO");
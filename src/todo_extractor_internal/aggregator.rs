@@ -1,4 +1,5 @@
 use log::debug;
+use std::borrow::Cow;
 use std::path::Path;
 use std::{marker::PhantomData, path::PathBuf};
 
@@ -152,25 +153,33 @@ fn flatten_comment_lines(lines: &[CommentLine]) -> Vec<CommentLine> {
 /// Determines the effective extension for a file, handling special cases like Dockerfile.
 ///
 /// - `path`: The file path to analyze.
-/// - Returns: The effective extension as a string.
-pub fn get_effective_extension(path: &Path) -> String {
-    let extension = path
-        .extension()
-        .and_then(|s| s.to_str())
-        .unwrap_or("")
-        .to_lowercase();
+/// - Returns: The effective extension, lowercased. Borrowed from `path` when it
+///   is already lowercase, which is the common case.
+pub fn get_effective_extension(path: &Path) -> Cow<'_, str> {
+    // Look the file name up once and split on its last dot directly, instead
+    // of letting `Path::extension` and `Path::file_name` each re-parse the path.
+    let file_name = path.file_name().map_or(&b""[..], |n| n.as_encoded_bytes());
 
     // Handle special filenames like Dockerfile which have no extension
-    let file_name = path
-        .file_name()
-        .and_then(|s| s.to_str())
-        .unwrap_or("")
-        .to_lowercase();
-
-    if extension.is_empty() && file_name == "dockerfile" {
-        "dockerfile".to_string()
+    if file_name.eq_ignore_ascii_case(b"dockerfile") {
+        return Cow::Borrowed("dockerfile");
+    }
+
+    match file_name.iter().rposition(|&b| b == b'.') {
+        // A leading dot (e.g. `.bashrc`) is a hidden file, not an extension
+        Some(dot) if dot > 0 => std::str::from_utf8(&file_name[dot + 1..])
+            .map(to_lowercase_cow)
+            .unwrap_or(Cow::Borrowed("")),
+        _ => Cow::Borrowed(""),
+    }
+}
+
+/// Lowercases `s`, only allocating when it actually contains something to lowercase.
+fn to_lowercase_cow(s: &str) -> Cow<'_, str> {
+    if s.is_ascii() && !s.bytes().any(|b| b.is_ascii_uppercase()) {
+        Cow::Borrowed(s)
     } else {
-        extension
+        Cow::Owned(s.to_lowercase())
     }
 }
 
@@ -272,18 +281,47 @@ pub fn extract_marked_items_from_file(
     file: &Path,
     marker_config: &MarkerConfig,
 ) -> Result<Vec<MarkedItem>, String> {
+    // Without a limit no file is ever skipped for its size.
+    extract_marked_items_from_file_with_limit(file, marker_config, None)
+        .map(Option::unwrap_or_default)
+}
+
+/// Size limit applied by the CLI when `--max-file-size` is not given.
+pub(crate) const DEFAULT_MAX_FILE_SIZE: u64 = 1024 * 1024;
+
+/// Like [`extract_marked_items_from_file`], but files larger than
+/// `max_file_size` bytes are skipped without being read.
+///
+/// Returns `Ok(None)` for a skipped file, so callers can tell it apart from
+/// a file that was read and holds no marked items.
+pub fn extract_marked_items_from_file_with_limit(
+    file: &Path,
+    marker_config: &MarkerConfig,
+    max_file_size: Option<u64>,
+) -> Result<Option<Vec<MarkedItem>>, String> {
     let effective_ext = get_effective_extension(file);
     let parser_fn = match get_parser_for_extension(&effective_ext, file) {
         Some(parser) => parser,
         None => {
             // Skip unsupported file types without reading content
             info!("Skipping unsupported file type: {:?}", file);
-            return Ok(Vec::new());
+            return Ok(Some(Vec::new()));
         }
     };
 
-    match std::fs::read_to_string(file) {
-        Ok(content) => {
+    match read_source_file(file, max_file_size) {
+        Ok(SourceFile::TooLarge { size, limit }) => {
+            // Same reasoning as the conflict-marker skip below: surface it
+            // without RUST_LOG, since the file's TODOs are silently missing.
+            eprintln!(
+                "rusty-todo-md: skipping {}: {} bytes exceeds the {} byte size limit",
+                file.display(),
+                size,
+                limit
+            );
+            Ok(None)
+        }
+        Ok(SourceFile::Content(content)) => {
             if content_has_conflict_markers(&content) {
                 // Use eprintln (not log::warn) so this surfaces without the
                 // user having to set RUST_LOG — these warnings are essential
@@ -292,17 +330,17 @@ pub fn extract_marked_items_from_file(
                     "rusty-todo-md: skipping {}: contains conflict markers",
                     file.display()
                 );
-                return Ok(Vec::new());
+                return Ok(Some(Vec::new()));
             }
             if !content_may_contain_marker(&content, &marker_config.markers) {
                 info!(
                     "Skipping file with no marker substrings present: {:?}",
                     file
                 );
-                return Ok(Vec::new());
+                return Ok(Some(Vec::new()));
             }
             let todos = extract_marked_items_with_parser(file, &content, parser_fn, marker_config);
-            Ok(todos)
+            Ok(Some(todos))
         }
         Err(e) => {
             error!("Warning: Could not read file {file:?}, skipping. Error: {e}");
@@ -311,6 +349,30 @@ pub fn extract_marked_items_from_file(
     }
 }
 
+/// Outcome of reading a source file with an optional size limit.
+enum SourceFile {
+    Content(String),
+    TooLarge { size: u64, limit: u64 },
+}
+
+/// Reads `file` into a string unless it is larger than `max_file_size` bytes.
+///
+/// The size comes from the already-open handle's metadata, so an oversized
+/// file is rejected before any of its bytes are read. That is one extra
+/// `fstat` per file: `read_to_string` still sizes its buffer on its own.
+fn read_source_file(file: &Path, max_file_size: Option<u64>) -> std::io::Result<SourceFile> {
+    use std::io::Read;
+
+    let mut handle = std::fs::File::open(file)?;
+    let size = handle.metadata()?.len();
+    if let Some(limit) = max_file_size.filter(|&limit| size > limit) {
+        return Ok(SourceFile::TooLarge { size, limit });
+    }
+    let mut content = String::with_capacity(size as usize);
+    handle.read_to_string(&mut content)?;
+    Ok(SourceFile::Content(content))
+}
+
 /// Cheap pre-parse check: return true iff at least one configured marker
 /// appears as a raw byte substring anywhere in `content`. Short-circuits the
 /// pest parse path for marker-free files (e.g. `package-lock.json`, long
@@ -888,6 +950,34 @@ fn some_function() {
         assert_eq!(todos[0].marker, "TODO:");
     }
 
+    #[test]
+    fn test_get_effective_extension() {
+        let test_cases = vec![
+            // (path, expected_extension, expected_borrowed)
+            ("src/main.rs", "rs", true),
+            ("src/MAIN.RS", "rs", false),
+            ("scripts/Build.Sh", "sh", false),
+            ("Dockerfile", "dockerfile", true),
+            ("docker/DOCKERFILE", "dockerfile", true),
+            ("README", "", true),
+            (".bashrc", "", true),
+            ("archive.tar.gz", "gz", true),
+            ("trailing.", "", true),
+            ("src/.hidden/config.YML", "yml", false),
+        ];
+
+        for (path, expected, expected_borrowed) in test_cases {
+            let ext = get_effective_extension(Path::new(path));
+            assert_eq!(ext, expected, "wrong extension for '{}'", path);
+            assert_eq!(
+                matches!(ext, Cow::Borrowed(_)),
+                expected_borrowed,
+                "unexpected allocation behavior for '{}'",
+                path
+            );
+        }
+    }
+
     #[test]
     fn test_extract_marked_items_from_file_unsupported_extension() {
         init_logger();
@@ -1064,6 +1154,43 @@ fn some_function() {
         assert_eq!(result[0].marker, "TODO");
     }
 
+    #[test]
+    fn test_extract_marked_items_from_file_with_limit() {
+        use std::io::Write;
+        use tempfile::Builder;
+
+        init_logger();
+
+        let mut temp_file = Builder::new()
+            .suffix(".rs")
+            .tempfile()
+            .expect("Failed to create temp file");
+        temp_file
+            .write_all(b"// TODO: only found without a tight limit\nfn main() {}\n")
+            .expect("Failed to write");
+        temp_file.flush().expect("Failed to flush");
+
+        let config = MarkerConfig {
+            markers: vec!["TODO".to_string()],
+        };
+
+        let skipped = extract_marked_items_from_file_with_limit(temp_file.path(), &config, Some(8))
+            .expect("oversized file should be skipped, not fail");
+        assert!(
+            skipped.is_none(),
+            "oversized file should be reported as skipped"
+        );
+
+        let within_limit =
+            extract_marked_items_from_file_with_limit(temp_file.path(), &config, Some(1024))
+                .expect("extract should succeed");
+        assert_eq!(within_limit.map(|items| items.len()), Some(1));
+
+        let unlimited = extract_marked_items_from_file_with_limit(temp_file.path(), &config, None)
+            .expect("extract should succeed");
+        assert_eq!(unlimited.map(|items| items.len()), Some(1));
+    }
+
     #[test]
     fn test_content_may_contain_marker_basic() {
         let markers = vec!["TODO".to_string(), "FIXME".to_string()];
@@ -2,12 +2,14 @@ use crate::todo_md_internal::TodoCollection;
 use crate::MarkedItem;
 use log::{debug, info, warn};
 use regex::Regex;
-use std::collections::BTreeMap;
+use std::collections::{BTreeMap, HashSet};
 use std::fmt;
 use std::fs;
 use std::io;
+use std::io::Write as _;
 use std::path::Path;
 use std::path::PathBuf;
+use std::sync::OnceLock;
 
 #[derive(Debug)]
 pub enum TodoError {
@@ -33,37 +35,8 @@ impl From<io::Error> for TodoError {
 }
 
 pub fn validate_todo_file(todo_path: &std::path::Path) -> bool {
-    // TODO: add tests for this function
     match fs::read_to_string(todo_path) {
-        Ok(content) => {
-            if content.is_empty() {
-                info!("Empty TODO.md file");
-                return true;
-            }
-            // Expected patterns for a marker header, section header, and a TODO item line.
-            let marker_re = Regex::new(r"^#\s+\w+").unwrap();
-            let section_re = Regex::new(r"^##\s+(.*)$").unwrap();
-            let todo_re = Regex::new(r"^\*\s+\[(.+):(\d+)\]\(.+#L\d+\):\s*(.+)$").unwrap();
-            // Check each non‑empty line for a valid pattern.
-            for (i, line) in content.lines().enumerate() {
-                let line = line.trim();
-                if line.is_empty() {
-                    continue;
-                }
-                if !(marker_re.is_match(line)
-                    || section_re.is_match(line)
-                    || todo_re.is_match(line))
-                {
-                    warn!(
-                        "Invalid format on line {line_num}: {line}",
-                        line_num = i + 1,
-                        line = line
-                    );
-                    return false;
-                }
-            }
-            true
-        }
+        Ok(content) => parse_todo_content(&content).is_some(),
         Err(e) => {
             warn!(
                 "Failed to read {path}: {e}",
@@ -85,21 +58,60 @@ pub fn validate_todo_file(todo_path: &std::path::Path) -> bool {
 /// ```
 ///
 /// This function uses regex to detect section headers to set the current file context, and then
-/// parses subsequent todo item lines accordingly.
+/// parses subsequent todo item lines accordingly. The file is read and scanned once: validation
+/// happens in the same pass, and any unrecognized line fails the whole file.
 pub fn read_todo_file(todo_path: &Path) -> Result<Vec<MarkedItem>, TodoError> {
-    if !validate_todo_file(todo_path) {
-        return Err(TodoError::Parse("TODO.md validation failed".to_string()));
-    }
+    let content = match fs::read_to_string(todo_path) {
+        Ok(content) => content,
+        Err(e) => {
+            warn!(
+                "Failed to read {path}: {e}",
+                path = todo_path.display(),
+                e = e
+            );
+            return Err(TodoError::Parse("TODO.md validation failed".to_string()));
+        }
+    };
+    parse_todo_content(&content)
+        .ok_or_else(|| TodoError::Parse("TODO.md validation failed".to_string()))
+}
+
+/// Line patterns of the TODO.md format: marker header, section header and TODO item.
+struct TodoLineRegexes {
+    marker: Regex,
+    section: Regex,
+    item: Regex,
+}
 
-    let content = fs::read_to_string(todo_path)?;
+/// Returns the TODO.md line patterns, compiling them on first use only.
+fn todo_line_regexes() -> &'static TodoLineRegexes {
+    static REGEXES: OnceLock<TodoLineRegexes> = OnceLock::new();
+    REGEXES.get_or_init(|| TodoLineRegexes {
+        marker: Regex::new(r"^#\s+(\w+)").unwrap(),
+        section: Regex::new(r"^##\s+(.*)$").unwrap(),
+        item: Regex::new(r"^\*\s+\[(.+):(\d+)\]\(.+#L\d+\):\s*(.+)$").unwrap(),
+    })
+}
+
+/// Validates and parses TODO.md content in a single pass.
+///
+/// Every non-empty line must be a marker header, a section header or a TODO item;
+/// returns `None` on the first line that is none of those.
+fn parse_todo_content(content: &str) -> Option<Vec<MarkedItem>> {
+    if content.is_empty() {
+        info!("Empty TODO.md file");
+        return Some(Vec::new());
+    }
 
     let mut todos = Vec::new();
-    let marker_re = Regex::new(r"^#\s+(\w+)").unwrap();
-    let section_re = Regex::new(r"^##\s+(.*)$").unwrap();
-    let todo_re = Regex::new(r"^\*\s+\[(.+):(\d+)\]\(.+#L\d+\):\s*(.+)$").unwrap();
+    let TodoLineRegexes {
+        marker: marker_re,
+        section: section_re,
+        item: todo_re,
+    } = todo_line_regexes();
     let mut current_file: Option<String> = None;
     let mut current_marker: Option<String> = None;
-    for line in content.lines() {
+    for (i, line) in content.lines().enumerate() {
         let line = line.trim();
         if line.is_empty() {
             continue;
@@ -127,9 +139,16 @@ pub fn read_todo_file(todo_path: &Path) -> Result<Vec<MarkedItem>, TodoError> {
                 message,
                 marker,
             });
+            continue;
         }
+        warn!(
+            "Invalid format on line {line_num}: {line}",
+            line_num = i + 1,
+            line = line
+        );
+        return None;
     }
-    Ok(todos)
+    Some(todos)
 }
 
 pub fn sync_todo_file(
@@ -143,9 +162,19 @@ pub fn sync_todo_file(
 
     match read_todo_file(todo_path) {
         Ok(existing_todos) => {
+            // Files usually carry several TODOs: stat each distinct path
+            // once, then filter the items by set lookup.
+            let missing_files: HashSet<PathBuf> = existing_todos
+                .iter()
+                .map(|item| item.file_path.as_path())
+                .collect::<HashSet<&Path>>()
+                .into_iter()
+                .filter(|path| !path.exists())
+                .map(Path::to_path_buf)
+                .collect();
             let filtered_todos: Vec<MarkedItem> = existing_todos
                 .into_iter()
-                .filter(|item| item.file_path.exists())
+                .filter(|item| !missing_files.contains(&item.file_path))
                 .collect();
 
             debug!("Filtered out TODOs for non-existent files");
@@ -204,33 +233,35 @@ pub fn write_todo_file(todo_path: &Path, todos: Vec<MarkedItem>) -> std::io::Res
             .push(item);
     }
 
-    let mut content = String::new();
+    // Stream sections straight to the file through one buffered writer
+    // instead of holding the whole rendered document in memory.
+    let mut out = io::BufWriter::new(fs::File::create(todo_path)?);
     // Write each marker section
     for (marker, files) in marker_map {
-        content.push_str(&format!("# {marker}\n"));
+        writeln!(out, "# {marker}")?;
         // Write each file section under the marker
-        let file_entries: Vec<_> = files.into_iter().collect();
-        for (i, (file, items)) in file_entries.iter().enumerate() {
-            content.push_str(&format!("## {file}\n", file = file.display()));
-            // Sort items by line number for consistency
-            let mut sorted_items = items.clone();
-            sorted_items.sort_by_key(|item| item.line_number);
-            for item in sorted_items.iter() {
-                content.push_str(&format!(
-                    "* [{file}:{line}]({file}#L{line}): {message}\n",
-                    file = item.file_path.display(),
+        let file_count = files.len();
+        for (i, (file, mut items)) in files.into_iter().enumerate() {
+            // Every item in this section shares the same path: render it once.
+            let file = file.to_string_lossy();
+            writeln!(out, "## {file}")?;
+            // Sort items by line number for consistency (in place; we own them)
+            items.sort_by_key(|item| item.line_number);
+            for item in items.iter() {
+                writeln!(
+                    out,
+                    "* [{file}:{line}]({file}#L{line}): {message}",
                     line = item.line_number,
                     message = item.message
-                ));
+                )?;
             }
             // Add an extra newline between file sections (but not after the last one)
-            if i < file_entries.len() - 1 {
-                content.push('\n');
+            if i + 1 < file_count {
+                out.write_all(b"\n")?;
             }
         }
     }
-    // Write the final content to the TODO.md file
-    fs::write(todo_path, content)
+    out.flush()
 }
 
 #[cfg(test)]
@@ -384,6 +415,76 @@ mod tests {
         );
     }
 
+    #[test]
+    fn test_read_todo_file_rejects_invalid_line() {
+        init_logger();
+        let temp_dir = tempdir().unwrap();
+        let todo_path = temp_dir.path().join("TODO.md");
+
+        let content = r#"# TODO
+## src/main.rs
+* [src/main.rs:12](src/main.rs#L12): Refactor this function
+this line is not part of the format
+"#;
+        fs::write(&todo_path, content).unwrap();
+
+        assert!(!validate_todo_file(&todo_path));
+        assert!(matches!(
+            read_todo_file(&todo_path),
+            Err(TodoError::Parse(_))
+        ));
+    }
+
+    #[test]
+    fn test_read_todo_file_missing_file() {
+        init_logger();
+        let temp_dir = tempdir().unwrap();
+        let todo_path = temp_dir.path().join("TODO.md");
+
+        assert!(!validate_todo_file(&todo_path));
+        assert!(matches!(
+            read_todo_file(&todo_path),
+            Err(TodoError::Parse(_))
+        ));
+    }
+
+    #[test]
+    fn test_write_todo_file_exact_output() {
+        init_logger();
+        let temp_dir = tempdir().unwrap();
+        let todo_path = temp_dir.path().join("TODO.md");
+
+        let item = |file: &str, line: usize, message: &str, marker: &str| MarkedItem {
+            file_path: PathBuf::from(file),
+            line_number: line,
+            message: message.to_string(),
+            marker: marker.to_string(),
+        };
+        let items = vec![
+            item("src/b.rs", 7, "Second in b", "TODO"),
+            item("src/a.rs", 3, "Only in a", "TODO"),
+            item("src/b.rs", 2, "First in b", "TODO"),
+            item("src/a.rs", 1, "Broken", "FIXME"),
+        ];
+
+        write_todo_file(&todo_path, items).unwrap();
+
+        let content = fs::read_to_string(&todo_path).unwrap();
+        assert_eq!(
+            content,
+            "# FIXME\n\
+             ## src/a.rs\n\
+             * [src/a.rs:1](src/a.rs#L1): Broken\n\
+             # TODO\n\
+             ## src/a.rs\n\
+             * [src/a.rs:3](src/a.rs#L3): Only in a\n\
+             \n\
+             ## src/b.rs\n\
+             * [src/b.rs:2](src/b.rs#L2): First in b\n\
+             * [src/b.rs:7](src/b.rs#L7): Second in b\n"
+        );
+    }
+
     #[test]
     fn test_write_todo_file_sectioned() {
         init_logger();
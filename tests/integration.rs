@@ -447,4 +447,145 @@ mod integration_tests {
 
         log::info!("test_exclude_files_with_glob_patterns completed successfully");
     }
+
+    /// Test that every file is picked up when extraction is spread over worker threads.
+    #[test]
+    fn test_many_files_all_extracted() {
+        init_logger();
+        log::info!("Starting test_many_files_all_extracted");
+
+        let temp_dir = tempdir().expect("Failed to create temp dir");
+        let repo_path = temp_dir.path();
+        let todo_path = repo_path.join("TODO.md");
+
+        let files: Vec<PathBuf> = (0..100)
+            .map(|i| {
+                create_test_file(
+                    repo_path,
+                    &format!("src/file{i:03}.rs"),
+                    &format!("// TODO: Item {i:03}"),
+                )
+            })
+            .collect();
+
+        let mut args = vec![
+            "rusty-todo-md".to_string(),
+            "--todo-path".to_string(),
+            todo_path.to_str().unwrap().to_string(),
+        ];
+        args.extend(files.iter().map(|f| f.to_str().unwrap().to_string()));
+
+        let (temp_dir_git, repo) = init_repo().expect("Failed to init repo");
+        let fake_git_ops = FakeGitOps::new(repo, temp_dir_git, files, vec![]);
+
+        run_cli_with_args(args, &fake_git_ops);
+
+        let content = fs::read_to_string(&todo_path).expect("Failed to read TODO.md");
+        log::debug!("TODO.md content: {}", content);
+
+        for i in 0..100 {
+            assert!(
+                content.contains(&format!("file{i:03}.rs")),
+                "file{i:03}.rs should be listed"
+            );
+            assert!(
+                content.contains(&format!("Item {i:03}")),
+                "TODO from file{i:03}.rs should be listed"
+            );
+        }
+
+        log::info!("test_many_files_all_extracted completed successfully");
+    }
+
+    /// Test that files over --max-file-size are skipped and the rest are still scanned.
+    #[test]
+    fn test_max_file_size_skips_large_files() {
+        init_logger();
+        log::info!("Starting test_max_file_size_skips_large_files");
+
+        let temp_dir = tempdir().expect("Failed to create temp dir");
+        let repo_path = temp_dir.path();
+        let todo_path = repo_path.join("TODO.md");
+
+        let small = create_test_file(repo_path, "small.rs", "// TODO: Small file");
+        let large_content = format!("// TODO: Large file\n{}", "// padding\n".repeat(100));
+        let large = create_test_file(repo_path, "large.rs", &large_content);
+
+        let args = vec![
+            "rusty-todo-md".to_string(),
+            "--todo-path".to_string(),
+            todo_path.to_str().unwrap().to_string(),
+            "--max-file-size".to_string(),
+            "256".to_string(),
+            small.to_str().unwrap().to_string(),
+            large.to_str().unwrap().to_string(),
+        ];
+
+        let (temp_dir_git, repo) = init_repo().expect("Failed to init repo");
+        let fake_git_ops = FakeGitOps::new(repo, temp_dir_git, vec![small, large], vec![]);
+
+        run_cli_with_args(args, &fake_git_ops);
+
+        let content = fs::read_to_string(&todo_path).expect("Failed to read TODO.md");
+        log::debug!("TODO.md content: {}", content);
+
+        assert!(
+            content.contains("Small file"),
+            "TODO from the small file should be listed"
+        );
+        assert!(
+            !content.contains("Large file"),
+            "file over --max-file-size should be skipped"
+        );
+
+        log::info!("test_max_file_size_skips_large_files completed successfully");
+    }
+
+    /// Test that a file growing past --max-file-size keeps its existing TODO.md entries.
+    #[test]
+    fn test_max_file_size_keeps_existing_entries() {
+        init_logger();
+        log::info!("Starting test_max_file_size_keeps_existing_entries");
+
+        let temp_dir = tempdir().expect("Failed to create temp dir");
+        let repo_path = temp_dir.path();
+        let todo_path = repo_path.join("TODO.md");
+
+        let growing = create_test_file(repo_path, "growing.rs", "// TODO: Keep me");
+        let args = vec![
+            "rusty-todo-md".to_string(),
+            "--todo-path".to_string(),
+            todo_path.to_str().unwrap().to_string(),
+            "--max-file-size".to_string(),
+            "256".to_string(),
+            growing.to_str().unwrap().to_string(),
+        ];
+
+        let (temp_dir_git, repo) = init_repo().expect("Failed to init repo");
+        let fake_git_ops = FakeGitOps::new(repo, temp_dir_git, vec![growing.clone()], vec![]);
+
+        // First run: the file is within the limit and populates TODO.md.
+        run_cli_with_args(args.clone(), &fake_git_ops);
+        let content_initial = fs::read_to_string(&todo_path).expect("Failed to read TODO.md");
+        assert!(
+            content_initial.contains("Keep me"),
+            "Expected TODO message initially"
+        );
+
+        // Grow the file past the limit.
+        let large_content = format!("// TODO: Changed\n{}", "// padding\n".repeat(100));
+        fs::write(&growing, large_content).expect("Failed to grow test file");
+
+        // Second run: the file is skipped, so its entry must be left as it was.
+        run_cli_with_args(args, &fake_git_ops);
+        let content_updated =
+            fs::read_to_string(&todo_path).expect("Failed to read updated TODO.md");
+        log::debug!("Updated TODO.md content: {}", content_updated);
+        assert_eq!(
+            content_updated, content_initial,
+            "entries of a file skipped for its size should be kept"
+        );
+
+        log::info!("test_max_file_size_keeps_existing_entries completed successfully");
+    }
 }
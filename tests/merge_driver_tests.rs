@@ -319,6 +319,39 @@ fn source_files_with_conflict_markers_are_skipped() {
     );
 }
 
+#[test]
+fn regenerate_keeps_entries_of_files_over_max_file_size() {
+    let dir = init_repo();
+    let repo = dir.path();
+    fs::write(repo.join("big.rs"), "// TODO: keep me\n").unwrap();
+    fs::write(repo.join("small.rs"), "// TODO: small\n").unwrap();
+    git_must(repo, &["add", "."]);
+    git_must(repo, &["commit", "-q", "-m", "src"]);
+    run_tool_on(repo, &["big.rs", "small.rs"]);
+
+    // big.rs grows past the limit; --regenerate must not drop its entry.
+    fs::write(
+        repo.join("big.rs"),
+        format!("// TODO: changed\n{}", "// padding\n".repeat(100)),
+    )
+    .unwrap();
+
+    AssertCommand::new(bin())
+        .current_dir(repo)
+        .arg("--regenerate")
+        .arg("--max-file-size")
+        .arg("256")
+        .assert()
+        .success()
+        .stderr(predicates::str::contains("exceeds the 256 byte size limit"));
+
+    let todo = read(&repo.join("TODO.md"));
+    assert!(
+        todo.contains("keep me") && todo.contains("small") && !todo.contains("changed"),
+        "skipped file's existing entry must be carried over; got:\n{todo}"
+    );
+}
+
 /// End-to-end rebase reproducer — the scenario the design exists to fix.
 ///
 /// Two branches both insert lines above an existing TODO, shifting its line